@@ -1,14 +1,168 @@
 import os
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+import copy
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parsed config files keyed by path; entries are reused while the file's
+# (st_mtime_ns, st_size) signature is unchanged.
+_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
-@dataclass
+
+def _json_loads() -> Callable[[bytes], Any]:
+    """Return the JSON decoder, importing it on first use.
+
+    orjson is preferred when installed; importing it (or json) is deferred
+    because env-only runs never parse a file.
+    """
+    try:  # optional C-backed parser; stdlib json is the fallback
+        from orjson import loads
+    except ImportError:  # pragma: no cover - depends on environment
+        from json import loads  # type: ignore[assignment]
+    return loads
+
+
+def _read_config_file(config_file: Path) -> Dict[str, Any]:
+    """Return parsed JSON for ``config_file``, reusing a cached parse.
+
+    Callers receive a deep copy so mutations never leak between Config
+    instances.
+    """
+    st = config_file.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_CACHE.get(str(config_file))
+    if cached is None or cached[0] != key:
+        cached = (key, _json_loads()(config_file.read_bytes()))
+        _FILE_CACHE[str(config_file)] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated env value, dropping blank entries."""
+    out: List[str] = []
+    append = out.append
+    for item in value.split(","):
+        item = item.strip()
+        if item:
+            append(item)
+    return out
+
+
+# (env var, attribute path on Config ("" = Config itself), field, caster).
+# Unset or empty variables leave the existing value untouched.
+_ENV_SPEC: Tuple[Tuple[str, str, str, Callable[[str], Any]], ...] = (
+    # App settings
+    ("TESTFLIGHT_APP_IDS", "", "app_ids", _split_csv),
+    ("CHECK_INTERVAL_SECONDS", "", "check_interval_seconds", int),
+    ("CACHE_TTL_MINUTES", "", "cache_ttl_minutes", int),
+    ("MAX_CONCURRENCY", "", "max_concurrency", int),
+    # Notification settings
+    ("DISCORD_WEBHOOK_URL", "notifications", "discord_webhook_url", str),
+    ("SLACK_WEBHOOK_URL", "notifications", "slack_webhook_url", str),
+    ("EMAIL_SMTP_SERVER", "notifications", "email_smtp_server", str),
+    ("EMAIL_SMTP_PORT", "notifications", "email_smtp_port", int),
+    ("EMAIL_USERNAME", "notifications", "email_username", str),
+    ("EMAIL_PASSWORD", "notifications", "email_password", str),
+    ("EMAIL_RECIPIENTS", "notifications", "email_recipients", _split_csv),
+    # Pushover
+    ("PUSHOVER_USER_KEY", "notifications", "pushover_user_key", str),
+    ("PUSHOVER_API_TOKEN", "notifications", "pushover_api_token", str),
+    ("PUSHOVER_PRIORITY", "notifications", "pushover_priority", str),
+    ("PUSHOVER_SOUND", "notifications", "pushover_sound", str),
+    # Logging settings
+    ("LOG_LEVEL", "", "log_level", str),
+    ("LOG_FILE", "", "log_file", str),
+)
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Every variable Config consults; read once per process into _ENV_SNAPSHOT.
+_ENV_KEYS = tuple(spec[0] for spec in _ENV_SPEC) + ("TFM_SKIP_CONFIG_FILE",)
+_ENV_SNAPSHOT: Optional[Dict[str, str]] = None
+
+
+def _read_env() -> Dict[str, str]:
+    environ = os.environ
+    return {key: value for key in _ENV_KEYS if (value := environ.get(key))}
+
+
+def _env() -> Dict[str, str]:
+    """Return the cached snapshot of the non-empty config env vars."""
+    global _ENV_SNAPSHOT
+    if _ENV_SNAPSHOT is None:
+        _ENV_SNAPSHOT = _read_env()
+    return _ENV_SNAPSHOT
+
+
+def _skip_config_file() -> bool:
+    """Return True when TFM_SKIP_CONFIG_FILE opts out of reading config.json.
+
+    Otherwise the file is always read; its values override env scalars
+    because it is applied after the environment.
+    """
+    return _env().get("TFM_SKIP_CONFIG_FILE", "").lower() in _TRUTHY
+
+
+_OptStr = (str, type(None))
+
+# Accepted config.json shape: key -> (allowed types, list item type or None).
+# Built once at import; keys absent from the schema are ignored.
+_NOTIF_SCHEMA: Dict[str, Tuple[Tuple[type, ...], Optional[type]]] = {
+    "discord_webhook_url": (_OptStr, None),
+    "slack_webhook_url": (_OptStr, None),
+    "email_smtp_server": (_OptStr, None),
+    "email_smtp_port": ((int,), None),
+    "email_username": (_OptStr, None),
+    "email_password": (_OptStr, None),
+    "email_recipients": ((list, type(None)), str),
+    "pushover_user_key": (_OptStr, None),
+    "pushover_api_token": (_OptStr, None),
+    "pushover_priority": ((str, int, type(None)), None),
+    "pushover_sound": (_OptStr, None),
+}
+_FILE_SCHEMA: Dict[str, Tuple[Tuple[type, ...], Optional[type]]] = {
+    "app_ids": ((list,), str),
+    "check_interval_seconds": ((int,), None),
+    "cache_ttl_minutes": ((int,), None),
+    "max_concurrency": ((int,), None),
+    "log_level": ((str,), None),
+    "log_file": ((str,), None),
+    "notifications": ((dict, type(None)), None),
+}
+
+
+def _check_schema(
+    data: Any,
+    schema: Dict[str, Tuple[Tuple[type, ...], Optional[type]]],
+    prefix: str = "",
+) -> None:
+    """Raise ValueError if ``data`` does not match ``schema``."""
+    if not isinstance(data, dict):
+        raise ValueError(f"{prefix or 'config'}: expected object")
+    for key, value in data.items():
+        rule = schema.get(key)
+        if rule is None:
+            continue
+        types, item_type = rule
+        if not isinstance(value, types) or (
+            isinstance(value, bool) and bool not in types
+        ):
+            raise ValueError(
+                f"{prefix}{key}: expected {'/'.join(t.__name__ for t in types)},"
+                f" got {type(value).__name__}"
+            )
+        if (
+            item_type is not None
+            and isinstance(value, list)
+            and not all(isinstance(v, item_type) for v in value)
+        ):
+            raise ValueError(f"{prefix}{key}: items must be {item_type.__name__}")
+
+
+@dataclass(slots=True)
 class NotificationConfig:
     """Configuration for notification services."""
 
@@ -18,7 +172,7 @@ class NotificationConfig:
     email_smtp_port: int = 587
     email_username: Optional[str] = None
     email_password: Optional[str] = None
-    email_recipients: List[str] = field(default_factory=list)
+    email_recipients: Optional[List[str]] = None  # None == no recipients
     # Pushover
     pushover_user_key: Optional[str] = None
     pushover_api_token: Optional[str] = None
@@ -26,76 +180,92 @@ class NotificationConfig:
     pushover_sound: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, init=False, repr=False, eq=False)
 class Config:
-    """Main configuration class with validation."""
+    """Main configuration class with validation.
+
+    Fields are declared for introspection (``fields(Config)``); the
+    hand-written ``__init__`` assigns defaults once and then layers env and
+    config.json on top.
+    """
 
     app_ids: List[str] = field(default_factory=list)
     check_interval_seconds: int = 300  # seconds between cycles
     cache_ttl_minutes: int = 5
+    max_concurrency: int = 8  # simultaneous page fetches per cycle
     notifications: NotificationConfig = field(default_factory=NotificationConfig)
     log_level: str = "INFO"
     log_file: str = "testflight_monitor.log"
 
-    def __post_init__(self) -> None:
+    # Most recent (state key, instance) pair handed out by load_cached()
+    _LAST_LOADED: ClassVar[Optional[Tuple[Tuple[Any, ...], "Config"]]] = None
+
+    @classmethod
+    def load_cached(cls) -> "Config":
+        """Return a shared Config for the current env and config.json state.
+
+        The instance is rebuilt whenever the config env vars or the file's
+        (st_mtime_ns, st_size) signature change; the env snapshot is
+        refreshed on every call. Treat the instance as read-only.
+        """
+        try:
+            st = Path("config.json").stat()
+            file_key: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            file_key = None
+        global _ENV_SNAPSHOT
+        _ENV_SNAPSHOT = env = _read_env()
+        key = (file_key, tuple(env.items()))
+        last = cls._LAST_LOADED
+        if last is not None and last[0] == key:
+            return last[1]
+        instance = cls()
+        cls._LAST_LOADED = (key, instance)
+        return instance
+
+    @staticmethod
+    def invalidate_env_cache() -> None:
+        """Drop the env snapshot so the next Config re-reads os.environ."""
+        global _ENV_SNAPSHOT
+        _ENV_SNAPSHOT = None
+
+    def __init__(
+        self,
+        app_ids: Optional[List[str]] = None,
+        check_interval_seconds: int = 300,
+        cache_ttl_minutes: int = 5,
+        max_concurrency: int = 8,
+        notifications: Optional[NotificationConfig] = None,
+        log_level: str = "INFO",
+        log_file: str = "testflight_monitor.log",
+    ) -> None:
+        self.app_ids = list(app_ids) if app_ids else []
+        self.check_interval_seconds = check_interval_seconds
+        self.cache_ttl_minutes = cache_ttl_minutes
+        self.max_concurrency = max_concurrency
+        self.notifications = (
+            notifications if notifications is not None else NotificationConfig()
+        )
+        self.log_level = log_level
+        self.log_file = log_file
         # If user provided app_ids in constructor, remember so file
-        # won't override them from [config.json](http://_vscodecontentref_/1)
+        # won't override them from config.json
         explicit = bool(self.app_ids)
         self._load_from_env()
-        # Only load app_ids from file if still empty
-        self._load_from_file(load_app_ids=not self.app_ids and not explicit)
+        if not _skip_config_file():
+            # Only load app_ids from file if still empty
+            self._load_from_file(load_app_ids=not self.app_ids and not explicit)
         self._validate()
 
     def _load_from_env(self) -> None:
-        """Load configuration from environment variables."""
-        # App settings
-        env_ids = os.getenv("TESTFLIGHT_APP_IDS")
-        if env_ids:
-            self.app_ids = [i.strip() for i in env_ids.split(",") if i.strip()]
-
-        env_interval = os.getenv("CHECK_INTERVAL_SECONDS")
-        if env_interval:
-            self.check_interval_seconds = int(env_interval)
-
-        env_ttl = os.getenv("CACHE_TTL_MINUTES")
-        if env_ttl:
-            self.cache_ttl_minutes = int(env_ttl)
-
-        # Notification settings
-        self.notifications.discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-        self.notifications.slack_webhook_url = os.getenv("SLACK_WEBHOOK_URL")
-        self.notifications.email_smtp_server = os.getenv("EMAIL_SMTP_SERVER")
-
-        env_port = os.getenv("EMAIL_SMTP_PORT")
-        if env_port:
-            self.notifications.email_smtp_port = int(env_port)
-
-        self.notifications.email_username = os.getenv("EMAIL_USERNAME")
-        self.notifications.email_password = os.getenv("EMAIL_PASSWORD")
-
-        env_recipients = os.getenv("EMAIL_RECIPIENTS")
-        if env_recipients:
-            self.notifications.email_recipients = [
-                r.strip() for r in env_recipients.split(",") if r.strip()
-            ]
-
-        # Pushover
-        self.notifications.pushover_user_key = os.getenv(
-            "PUSHOVER_USER_KEY", self.notifications.pushover_user_key
-        )
-        self.notifications.pushover_api_token = os.getenv(
-            "PUSHOVER_API_TOKEN", self.notifications.pushover_api_token
-        )
-        self.notifications.pushover_priority = os.getenv(
-            "PUSHOVER_PRIORITY", self.notifications.pushover_priority
-        )
-        self.notifications.pushover_sound = os.getenv(
-            "PUSHOVER_SOUND", self.notifications.pushover_sound
-        )
-
-        # Logging settings
-        self.log_level = os.getenv("LOG_LEVEL", self.log_level)
-        self.log_file = os.getenv("LOG_FILE", self.log_file)
+        """Load configuration from environment variables (see ``_ENV_SPEC``)."""
+        env = _env()
+        for key, path, attr, cast in _ENV_SPEC:
+            value = env.get(key)
+            if not value:
+                continue
+            target = getattr(self, path) if path else self
+            setattr(target, attr, cast(value))
 
     def _load_from_file(self, load_app_ids: bool = True) -> None:
         """Load configuration from config.json if it exists.
@@ -106,24 +276,22 @@ class Config:
         config_file = Path("config.json")
         if config_file.exists():
             try:
-                with open(config_file, "r") as f:
-                    config_data = json.load(f)
+                config_data = _read_config_file(config_file)
+                _check_schema(config_data, _FILE_SCHEMA)
+                notif = config_data.get("notifications") or {}
+                _check_schema(notif, _NOTIF_SCHEMA, "notifications.")
                 if load_app_ids and "app_ids" in config_data and not self.app_ids:
                     self.app_ids = config_data["app_ids"]
                 # Other scalar fields
                 for key, value in config_data.items():
-                    if key == "notifications" or key == "app_ids":
-                        continue
-                    if hasattr(self, key):
+                    if key in _SCALAR_FIELDS:
                         setattr(self, key, value)
-                notif = config_data.get("notifications", {}) or {}
-                if isinstance(notif, dict):
-                    for k, v in notif.items():  # noqa: B905
-                        if hasattr(self.notifications, k):
-                            setattr(self.notifications, k, v)
-                logger.info("Configuration loaded from config.json")
+                for k, v in notif.items():
+                    if k in _NOTIF_FIELDS:
+                        setattr(self.notifications, k, v)
+                logger.info("Configuration loaded from %s", config_file)
             except Exception as e:
-                logger.warning(f"Failed to load config.json: {e}")
+                logger.warning("Failed to load %s: %s", config_file, e)
 
     def _validate(self) -> None:
         """Validate configuration values."""
@@ -133,14 +301,15 @@ class Config:
                 "config.json"
             )
 
-        # Validate app IDs format
+        # Validate and clean app IDs in one pass
+        cleaned: List[str] = []
         for app_id in self.app_ids:
+            stripped = app_id.strip() if app_id else ""
             # Allow 4+ characters (tests use 'FAKE')
-            if not app_id or len(app_id.strip()) < 4:
+            if len(stripped) < 4:
                 raise ValueError(f"Invalid app ID: {app_id}")
-
-        # Clean up app IDs
-        self.app_ids = [app_id.strip() for app_id in self.app_ids if app_id.strip()]
+            cleaned.append(stripped)
+        self.app_ids = cleaned
 
         if self.check_interval_seconds < 60:
             logger.warning(
@@ -151,6 +320,9 @@ class Config:
         if self.cache_ttl_minutes < 1:
             raise ValueError("Cache TTL must be at least 1 minute")
 
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         # Validate notification configuration
         has_notification = any(
             [
@@ -173,6 +345,7 @@ class Config:
             "app_ids": self.app_ids,
             "check_interval_seconds": self.check_interval_seconds,
             "cache_ttl_minutes": self.cache_ttl_minutes,
+            "max_concurrency": self.max_concurrency,
             "log_level": self.log_level,
             "log_file": self.log_file,
             "notifications_configured": {
@@ -186,3 +359,12 @@ class Config:
             },
         }
         return config_dict
+
+
+# Field names assignable from config.json, computed once from the dataclasses
+# (app_ids and notifications are handled separately by _load_from_file).
+_SCALAR_FIELDS = frozenset(f.name for f in fields(Config)) - {
+    "app_ids",
+    "notifications",
+}
+_NOTIF_FIELDS = frozenset(f.name for f in fields(NotificationConfig))
@@ -1,386 +1,676 @@
-import asyncio
-import logging
-import signal
-import sys
-import os
-import time
-from pathlib import Path
-import argparse
-from typing import Optional, List, Dict, Any
-import contextlib
-import json
-
-from config import Config
-
-try:  # monitor module may not yet exist during partial development
-    from monitor import TestFlightMonitor  # type: ignore
-except Exception:  # pragma: no cover - fallback stub
-
-    class TestFlightMonitor:  # type: ignore
-        def __init__(self, *_: Any, **__: Any) -> None:
-            pass
-
-        async def __aenter__(self) -> "TestFlightMonitor":  # type: ignore
-            return self
-
-        async def __aexit__(self, *_exc: Any) -> bool:
-            return False
-
-        async def run_cycle(self) -> None:  # pragma: no cover
-            return None
-
-        async def check_multiple_apps(
-            self, app_ids: List[str]
-        ) -> List[Dict[str, Any]]:  # pragma: no cover
-            return [{"app_id": a, "available": False} for a in app_ids]
-
-
-class CLIApplication:
-    """CLI with improved logging, signal handling, and resilience."""
-
-    def __init__(self):
-        self.monitor: Optional[TestFlightMonitor] = None
-        self.running: bool = False
-        self._stop_event: asyncio.Event | None = None
-        self._logging_initialized = False
-        # Logging init deferred until we know desired level (via CLI/env)
-        self._defer_signal_setup = False
-        self.logger = logging.getLogger(__name__)
-
-    # ----------------------------- Logging ---------------------------------
-    def setup_logging(
-        self,
-        level: Optional[str] = None,
-        utc: bool = False,
-        json_logs: bool = False,
-    ) -> None:
-        """Setup logging with rotation; idempotent.
-
-        Level precedence: explicit arg > env TFM_LOG_LEVEL > default INFO.
-        If json_logs True (or env TFM_LOG_JSON=1), use structured JSON lines.
-        """
-        if self._logging_initialized:
-            if level:
-                logging.getLogger().setLevel(level.upper())
-            return
-        from logging.handlers import RotatingFileHandler
-
-        Path("logs").mkdir(exist_ok=True)
-
-        file_handler = RotatingFileHandler(
-            "logs/testflight_monitor.log",
-            maxBytes=10 * 1024 * 1024,
-            backupCount=5,
-        )
-        console_handler = logging.StreamHandler()
-
-        class _UTCFormatter(logging.Formatter):
-            converter = time.gmtime
-
-        # Decide on formatter (plain vs JSON)
-        json_env = os.getenv("TFM_LOG_JSON") in {"1", "true", "TRUE", "yes"}
-        use_json = json_logs or json_env
-        if use_json:
-
-            class _JSONFormatter(logging.Formatter):  # noqa: D401 - simple
-                def format(
-                    self, record: logging.LogRecord
-                ) -> str:  # type: ignore[override]
-                    base = {
-                        "ts": (
-                            time.strftime(
-                                "%Y-%m-%dT%H:%M:%SZ",
-                                time.gmtime(record.created),
-                            )
-                            if utc
-                            else time.strftime(
-                                "%Y-%m-%dT%H:%M:%S",
-                                time.localtime(record.created),
-                            )
-                        ),
-                        "level": record.levelname,
-                        "name": record.name,
-                        "msg": record.getMessage(),
-                    }
-                    if record.exc_info:
-                        base["exc_info"] = self.formatException(record.exc_info)
-                    return json.dumps(base, ensure_ascii=False)
-
-            formatter = _JSONFormatter()
-        else:
-            fmt = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
-            datefmt = "%Y-%m-%dT%H:%M:%SZ" if utc else None
-            FormatterClass = _UTCFormatter if utc else logging.Formatter
-            formatter = FormatterClass(fmt, datefmt=datefmt)
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        root = logging.getLogger()
-        # Avoid duplicate handlers if root already configured (e.g. tests)
-        if not root.handlers:
-            root.addHandler(file_handler)
-            root.addHandler(console_handler)
-
-        resolved_level = (level or os.getenv("TFM_LOG_LEVEL") or "INFO").upper()
-        if resolved_level not in {
-            "CRITICAL",
-            "ERROR",
-            "WARNING",
-            "INFO",
-            "DEBUG",
-            "NOTSET",
-        }:
-            resolved_level = "INFO"
-        root.setLevel(resolved_level)
-        self._logging_initialized = True
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug("Logging initialized (level=%s, utc=%s)", resolved_level, utc)
-
-    # ------------------------- Signal Handling -----------------------------
-    def setup_signal_handlers(self) -> None:
-        """Register signal handlers using the asyncio loop."""
-        if sys.platform == "win32":  # add_signal_handler lacks SIGTERM
-            return
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # Loop not ready yet; will attempt later
-            self._defer_signal_setup = True
-            return
-
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            with contextlib.suppress(NotImplementedError):
-                loop.add_signal_handler(sig, self.request_stop)
-        self._defer_signal_setup = False
-
-    def request_stop(self) -> None:
-        if self.running:
-            self.logger.info("Shutdown signal received; stopping...")
-        self.running = False
-        if self._stop_event is not None:
-            self._stop_event.set()
-
-    # ----------------------------- Run Loop --------------------------------
-    async def _monitor_loop(self, config: Config) -> None:
-        """Monitoring loop with backoff and fixed cadence."""
-        assert self.monitor is not None
-        interval = int(getattr(config, "check_interval_seconds", 60))
-        backoff: float = 0.2 if interval <= 1 else 5.0
-        max_backoff = 300.0
-        self._stop_event = asyncio.Event()
-        async with self.monitor:
-            cycle = 0
-            while self.running:
-                cycle += 1
-                cycle_start = asyncio.get_running_loop().time()
-                try:
-                    self.logger.debug("Starting cycle %d", cycle)
-                    await self.monitor.run_cycle()
-                    backoff = 0.2 if interval <= 1 else 5.0  # reset
-                except asyncio.CancelledError:
-                    raise
-                except Exception as e:  # noqa: BLE001
-                    self.logger.error(
-                        "Cycle %d error (retry in %.2fs): %s",
-                        cycle,
-                        backoff,
-                        e,
-                        exc_info=True,
-                    )
-                    try:
-                        # Jitter backoff +/- 20% to avoid sync collisions
-                        import random
-
-                        jitter = backoff * (0.8 + random.random() * 0.4)
-                        await asyncio.wait_for(self._stop_event.wait(), timeout=jitter)
-                    except asyncio.TimeoutError:
-                        pass
-                    backoff = min(backoff * 1.8, max_backoff)
-                    continue
-
-                elapsed = asyncio.get_running_loop().time() - cycle_start
-                remaining = max(0.0, interval - elapsed)
-                self.logger.debug(
-                    "Cycle %d in %.2fs (sleep %.2fs)",
-                    cycle,
-                    elapsed,
-                    remaining,
-                )
-                if remaining <= 0:
-                    continue
-                try:
-                    await asyncio.wait_for(self._stop_event.wait(), timeout=remaining)
-                except asyncio.TimeoutError:
-                    pass
-
-    async def run(self, config_path: Optional[str] = None) -> None:
-        """Entry point to run continuous monitoring until stopped."""
-        try:
-            config = Config()
-        except Exception as e:
-            logging.getLogger(__name__).critical(
-                "Configuration load failed: %s", e, exc_info=True
-            )
-            sys.exit(2)
-
-        app_ids: List[str] = getattr(config, "app_ids", [])
-        if not app_ids:
-            self.logger.warning("No app IDs configured; exiting.")
-            return
-
-        if hasattr(config, "to_dict") and callable(getattr(config, "to_dict")):
-            try:
-                cfg_info: Any = config.to_dict()  # type: ignore[attr-defined]
-                self.logger.info("Configuration loaded: %s", cfg_info)
-            except Exception:  # pragma: no cover - defensive
-                self.logger.debug("Config to_dict() failed", exc_info=True)
-
-        self.monitor = TestFlightMonitor(config)
-        self.running = True
-        self.setup_signal_handlers()
-        if self._defer_signal_setup:
-            self.setup_signal_handlers()
-
-        self.logger.info("TestFlight monitoring started")
-        try:
-            await self._monitor_loop(config)
-        finally:
-            self.logger.info("TestFlight monitoring stopped")
-
-    # ---------------------------- Single Check -----------------------------
-    async def run_single_check(self, config_path: Optional[str]) -> int:
-        """Run a single availability check; return exit code."""
-        try:
-            config = Config()
-        except Exception as e:
-            print(f"✗ Configuration error: {e}")
-            return 2
-
-        app_ids: List[str] = getattr(config, "app_ids", [])
-        if not app_ids:
-            print("No app IDs configured.")
-            return 3
-
-        monitor = TestFlightMonitor(config)
-        exit_code = 0
-        async with monitor:
-            results = await monitor.check_multiple_apps(app_ids)
-            for result in results:
-                status = "Available" if result.get("available") else "Not Available"
-                if result.get("available"):
-                    exit_code = 0  # explicit for clarity
-                print(f"{result['app_id']}: {status}")
-        return exit_code
-
-
-def main():
-    """CLI entry point with argument parsing."""
-    parser = argparse.ArgumentParser(description="TestFlight Monitor")
-    parser.add_argument("--config", help="Path to config file")
-    parser.add_argument(
-        "--check",
-        "--once",
-        action="store_true",
-        help="Run single check and exit",
-    )
-    parser.add_argument(
-        "--validate",
-        action="store_true",
-        help="Validate configuration and exit",
-    )
-    parser.add_argument(
-        "--log-level",
-        dest="log_level",
-        help="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)",
-    )
-    parser.add_argument(
-        "--log-utc",
-        action="store_true",
-        help="Log timestamps in UTC (ISO 8601)",
-    )
-    parser.add_argument(
-        "--log-json",
-        action="store_true",
-        help="Emit structured JSON log lines",
-    )
-    parser.add_argument(
-        "--self-test",
-        action="store_true",
-        help=(
-            "Run a quick internal self-test (config load + one dry cycle) and " "exit"
-        ),
-    )
-    parser.add_argument(
-        "--version",
-        action="store_true",
-        help="Print version and exit",
-    )
-
-    args = parser.parse_args()
-
-    if args.version:
-        try:
-            from __init__ import __version__  # type: ignore
-        except Exception:  # pragma: no cover
-            __version__ = "unknown"
-        print(__version__)
-        return
-
-    if args.validate:
-        try:
-            config = Config()
-            print("✓ Configuration is valid")
-            print(f"Monitoring {len(config.app_ids)} apps:")
-            for app_id in config.app_ids:
-                print(f"  - {app_id}")
-            return
-        except Exception as e:
-            print(f"✗ Configuration error: {e}")
-            sys.exit(2)
-
-    app = CLIApplication()
-    app.setup_logging(
-        level=args.log_level,
-        utc=args.log_utc,
-        json_logs=args.log_json,
-    )
-
-    if args.self_test:
-        # Minimal self-test: validate config and run one cycle with network
-        # disabled (network fetch monkeypatched to always return False)
-        try:  # noqa: BLE001 - intentional broad catch for user feedback
-            cfg = Config()
-            app.monitor = TestFlightMonitor(cfg)
-            # Monkeypatch monitor network fetch to always return False quickly
-            if hasattr(app.monitor, "_fetch_availability"):
-
-                async def _fake_fetch(app_id: str) -> bool:  # type: ignore
-                    return False
-
-                setattr(app.monitor, "_fetch_availability", _fake_fetch)
-
-            async def run_once():
-                async with app.monitor:  # type: ignore
-                    await app.monitor.run_cycle()  # type: ignore
-
-            asyncio.run(run_once())
-            print("✓ Self-test passed")
-            sys.exit(0)
-        except Exception as e:  # noqa: BLE001 pragma: no cover
-            print(f"✗ Self-test failed: {e}")
-            sys.exit(5)
-
-    if args.check:
-        exit_code = asyncio.run(app.run_single_check(config_path=args.config))
-        sys.exit(exit_code)
-
-    # Continuous monitoring
-    try:
-        asyncio.run(app.run(config_path=args.config))
-    except KeyboardInterrupt:
-        # Already handled via signal; fallback for limited platforms
-        pass
-
-
-if __name__ == "__main__":  # pragma: no cover
-    main()
+import asyncio
+import atexit
+import logging
+import signal
+import sys
+import os
+import random
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+import contextlib
+import copy
+import functools
+
+from config import _TRUTHY, Config
+
+if TYPE_CHECKING:  # pragma: no cover
+    import argparse
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+    from monitor import TestFlightMonitor
+
+
+_T = TypeVar("_T")
+
+
+def _loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's loop factory on POSIX when installed, else None."""
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop  # type: ignore[no-any-return]
+
+
+@contextlib.contextmanager
+def _loop_runner() -> Iterator[Callable[[Coroutine[Any, Any, _T]], _T]]:
+    """Yield ``run(coro)`` backed by a single event loop for the CLI.
+
+    Uses asyncio.Runner on 3.11+; on 3.10 a plain loop torn down the way
+    asyncio.run does it (cancel leftover tasks, shut down async generators
+    and the default executor, unset the loop). The loop is uvloop's when
+    available (see ``_loop_factory``).
+    """
+    factory = _loop_factory()
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            yield runner.run
+        return
+    # Python 3.10
+    loop = factory() if factory else asyncio.new_event_loop()  # pragma: no cover
+    asyncio.set_event_loop(loop)
+    try:
+        yield loop.run_until_complete
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+            for task in pending:
+                if not task.cancelled() and task.exception() is not None:
+                    loop.call_exception_handler(
+                        {
+                            "message": "unhandled exception during shutdown",
+                            "exception": task.exception(),
+                            "task": task,
+                        }
+                    )
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+class _StubMonitor:
+    """Fallback used when the monitor module cannot be imported."""
+
+    def __init__(self, *_: Any, **__: Any) -> None:
+        pass
+
+    async def __aenter__(self) -> "_StubMonitor":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> bool:
+        return False
+
+    async def run_cycle(self) -> None:  # pragma: no cover
+        return None
+
+    async def check_multiple_apps(
+        self, app_ids: List[str]
+    ) -> List[Dict[str, Any]]:  # pragma: no cover
+        return [{"app_id": a, "available": False} for a in app_ids]
+
+    async def iter_check_apps(
+        self, app_ids: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:  # pragma: no cover
+        for result in await self.check_multiple_apps(app_ids):
+            yield result
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``TestFlightMonitor`` lazily (PEP 562).
+
+    Importing monitor pulls in aiohttp, which ``--help``,
+    ``--version`` and ``--validate`` never need.
+    """
+    if name == "TestFlightMonitor":
+        monitor_cls: type[Any]
+        try:  # monitor module may not yet exist during partial development
+            from monitor import TestFlightMonitor
+
+            monitor_cls = TestFlightMonitor
+        except Exception:  # pragma: no cover - fallback stub
+            monitor_cls = _StubMonitor
+        globals()[name] = monitor_cls
+        return monitor_cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _monitor_class() -> "type[TestFlightMonitor]":
+    """Return the monitor class, importing it on first use."""
+    return sys.modules[__name__].TestFlightMonitor  # type: ignore[no-any-return]
+
+
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+_LOG_LEVELS = frozenset({"CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"})
+
+
+class _UTCFormatter(logging.Formatter):
+    converter = time.gmtime
+
+
+class _JSONFormatter(logging.Formatter):
+    """One JSON object per record (ts, level, name, msg[, exc_info])."""
+
+    def __init__(self, utc: bool = False) -> None:
+        super().__init__()
+        import json  # only needed when JSON logging is selected
+
+        self.utc = utc
+        self._ts_fmt = "%Y-%m-%dT%H:%M:%SZ" if utc else "%Y-%m-%dT%H:%M:%S"
+        self._to_struct = time.gmtime if utc else time.localtime
+        # Timestamps have 1s resolution; reuse the string within a second
+        self._last_sec = -1
+        self._last_ts = ""
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._last_ts = time.strftime(self._ts_fmt, self._to_struct(sec))
+            self._last_sec = sec
+        encode = self._encode
+        msg = record.msg
+        if record.args or not isinstance(msg, str):
+            msg = record.getMessage()
+        # Fixed keys: only the free-form values need JSON escaping. Output
+        # matches json.dumps(..., ensure_ascii=False) of the same dict.
+        line = (
+            f'{{"ts": "{self._last_ts}", "level": {encode(record.levelname)}, '
+            f'"name": {encode(record.name)}, "msg": {encode(msg)}'
+        )
+        if record.exc_info:
+            exc = encode(self.formatException(record.exc_info))
+            return f'{line}, "exc_info": {exc}}}'
+        return line + "}"
+
+
+@functools.lru_cache(maxsize=None)
+def _log_handler_classes() -> Tuple[Type["QueueHandler"], Type["RotatingFileHandler"]]:
+    """Define the queue and file handler classes on first use.
+
+    They subclass logging.handlers classes, so defining them here keeps that
+    import (and ``queue``) off the startup path until logging is installed.
+    """
+    from logging.handlers import QueueHandler, RotatingFileHandler
+
+    class _LocalQueueHandler(QueueHandler):
+        """QueueHandler for an in-process listener.
+
+        Unlike the stock ``prepare`` the record is not pre-formatted, so
+        the listener's formatter still sees ``exc_info`` (JSON logs). The
+        message is merged here so later mutation of args cannot leak.
+        """
+
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            record = copy.copy(record)
+            if record.args or not isinstance(record.msg, str):
+                record.msg = record.getMessage()
+                record.args = None
+            return record
+
+    class _SizedRotatingFileHandler(RotatingFileHandler):
+        """RotatingFileHandler that tracks the file size itself.
+
+        The stock handler seeks/tells on every record to decide on
+        rollover and formats each record twice. Here the size is counted
+        as each line is written; lines are still flushed one by one.
+        """
+
+        def __init__(self, *args: Any, **kw: Any):
+            self._size = 0
+            super().__init__(*args, **kw)
+
+        def _open(self):  # type: ignore[no-untyped-def]
+            stream = super()._open()
+            self._size = os.fstat(stream.fileno()).st_size
+            return stream
+
+        def shouldRollover(self, record: logging.LogRecord) -> bool:
+            return 0 < self.maxBytes <= self._size
+
+        def emit(self, record: logging.LogRecord) -> None:
+            try:
+                if self.shouldRollover(record):
+                    self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                stream = self.stream
+                msg = self.format(record) + self.terminator
+                stream.write(msg)
+                self.flush()
+                # Count encoded bytes so non-ASCII records can't overrun
+                # maxBytes. self.encoding may be the "locale" placeholder;
+                # the stream knows the codec actually in use.
+                self._size += (
+                    len(msg)
+                    if msg.isascii()
+                    else len(msg.encode(stream.encoding, "replace"))
+                )
+            except Exception:  # noqa: BLE001 - mirror logging semantics
+                self.handleError(record)
+
+    return _LocalQueueHandler, _SizedRotatingFileHandler
+
+
+class CLIApplication:
+    """CLI with improved logging, signal handling, and resilience."""
+
+    __slots__ = (
+        "monitor",
+        "running",
+        "_stop_event",
+        "_logging_initialized",
+        "logger",
+        "_log_listener",
+        "_prev_signal_handlers",
+    )
+
+    def __init__(self):
+        self.monitor: Optional["TestFlightMonitor"] = None
+        self.running: bool = False
+        self._stop_event: asyncio.Event | None = None
+        self._logging_initialized = False
+        # Logging init deferred until we know desired level (via CLI/env)
+        self.logger = logging.getLogger(__name__)
+        self._log_listener: Optional["QueueListener"] = None
+        self._prev_signal_handlers: Dict[signal.Signals, Any] = {}
+
+    # ----------------------------- Logging ---------------------------------
+    def setup_logging(
+        self,
+        level: Optional[str] = None,
+        utc: bool = False,
+        json_logs: bool = False,
+    ) -> None:
+        """Setup logging with rotation; idempotent.
+
+        Level precedence: explicit arg > env TFM_LOG_LEVEL > default INFO.
+        If json_logs True (or env TFM_LOG_JSON=1), use structured JSON lines.
+        """
+        if self._logging_initialized:
+            if level:
+                logging.getLogger().setLevel(level.upper())
+            return
+        env = os.environ
+        root = logging.getLogger()
+        # Avoid duplicate handlers if root already configured (e.g. tests);
+        # in that case no handler (or log file) is created at all.
+        if not root.handlers:
+            use_json = json_logs or env.get("TFM_LOG_JSON", "").lower() in _TRUTHY
+            self._install_handlers(utc=utc, use_json=use_json)
+
+        resolved_level = (level or env.get("TFM_LOG_LEVEL") or "INFO").upper()
+        if resolved_level not in _LOG_LEVELS:
+            resolved_level = "INFO"
+        root.setLevel(resolved_level)
+        self._logging_initialized = True
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug("Logging initialized (level=%s, utc=%s)", resolved_level, utc)
+
+    def _install_handlers(self, utc: bool, use_json: bool) -> None:
+        """Attach the queue handler to root and start the file/console listener."""
+        import queue
+        from logging.handlers import QueueListener
+
+        Path("logs").mkdir(exist_ok=True)
+
+        queue_handler_cls, file_handler_cls = _log_handler_classes()
+        file_handler = file_handler_cls(
+            "logs/testflight_monitor.log",
+            maxBytes=10 * 1024 * 1024,
+            backupCount=5,
+        )
+        console_handler = logging.StreamHandler()
+
+        # Decide on formatter (plain vs JSON)
+        formatter: logging.Formatter
+        if use_json:
+            formatter = _JSONFormatter(utc=utc)
+        else:
+            fmt = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+            datefmt = "%Y-%m-%dT%H:%M:%SZ" if utc else None
+            FormatterClass = _UTCFormatter if utc else logging.Formatter
+            formatter = FormatterClass(fmt, datefmt=datefmt)
+        file_handler.setFormatter(formatter)
+        console_handler.setFormatter(formatter)
+
+        # File/console I/O happens on the listener thread so log calls
+        # made from the event loop never block on write(2) or rotation.
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logging.basicConfig(handlers=[queue_handler_cls(log_queue)], force=False)
+        self._log_listener = QueueListener(log_queue, file_handler, console_handler)
+        self._log_listener.start()
+        atexit.register(self.shutdown_logging)
+
+    def shutdown_logging(self) -> None:
+        """Flush queued log records and stop the listener thread."""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
+
+    # ------------------------- Signal Handling -----------------------------
+    def setup_signal_handlers(self) -> None:
+        """Route SIGINT/SIGTERM through the running loop to request_stop.
+
+        The loop's wakeup fd delivers signals as ordinary callbacks, so the
+        monitor loop never needs to poll ``self.running``. Must be called
+        from within the loop (``run`` does so). Previous handlers are saved
+        and reinstated by ``remove_signal_handlers``.
+        """
+        if sys.platform == "win32":  # add_signal_handler lacks SIGTERM
+            return
+        loop = asyncio.get_running_loop()
+        for sig in _STOP_SIGNALS:
+            prev = signal.getsignal(sig)
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Unsupported loop, or not on the main thread
+                continue
+            self._prev_signal_handlers[sig] = prev
+
+    def remove_signal_handlers(self) -> None:
+        """Reinstate the handlers that were active before setup."""
+        if sys.platform == "win32":
+            return
+        loop = asyncio.get_running_loop()
+        saved, self._prev_signal_handlers = self._prev_signal_handlers, {}
+        for sig, prev in saved.items():
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                loop.remove_signal_handler(sig)
+                if prev is not None:
+                    signal.signal(sig, prev)
+
+    def request_stop(self) -> None:
+        if self.running:
+            self.logger.info("Shutdown signal received; stopping...")
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    # ----------------------------- Run Loop --------------------------------
+    async def _monitor_loop(self, config: Config) -> None:
+        """Run cycles until stop is requested.
+
+        The cycles run in a worker task alongside a stop waiter; whichever
+        finishes first ends the loop, and a stop request cancels any
+        in-flight cycle instead of waiting for its HTTP calls to finish.
+        """
+        assert self.monitor is not None
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        async with self.monitor:
+            worker = asyncio.ensure_future(self._run_cycles(config))
+            stopper = asyncio.ensure_future(self._stop_event.wait())
+            try:
+                await asyncio.wait(
+                    {worker, stopper}, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                worker.cancel()
+                stopper.cancel()
+                await asyncio.gather(worker, stopper, return_exceptions=True)
+            if not worker.cancelled():
+                worker.result()  # surface unexpected worker failures
+
+    async def _run_cycles(self, config: Config) -> None:
+        """Cycle loop with backoff and fixed cadence (see _monitor_loop)."""
+        assert self.monitor is not None
+        interval = int(config.check_interval_seconds)
+        base_backoff = 0.2 if interval <= 1 else 5.0
+        backoff: float = base_backoff
+        max_backoff = 300.0
+        loop_time = asyncio.get_running_loop().time
+        run_cycle = self.monitor.run_cycle
+        cycle = 0
+        while self.running:
+            cycle += 1
+            cycle_start = loop_time()
+            # One level check per cycle covers both debug lines
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            try:
+                if debug:
+                    self.logger.debug("Starting cycle %d", cycle)
+                await run_cycle()
+                backoff = base_backoff  # reset
+            except Exception as e:  # noqa: BLE001 - CancelledError passes
+                # Decorrelated jitter: sleep = min(cap, U(base, 3 * prev)),
+                # so clients failing together do not retry in lockstep
+
+                backoff = min(max_backoff, random.uniform(base_backoff, backoff * 3))
+                self.logger.error(
+                    "Cycle %d error (retry in %.2fs): %s",
+                    cycle,
+                    backoff,
+                    e,
+                    exc_info=True,
+                )
+                await self._interruptible_sleep(backoff)
+                continue
+
+            elapsed = loop_time() - cycle_start
+            remaining = max(0.0, interval - elapsed)
+            if debug:
+                self.logger.debug(
+                    "Cycle %d in %.2fs (sleep %.2fs)",
+                    cycle,
+                    elapsed,
+                    remaining,
+                )
+            if remaining <= 0:
+                continue
+            await self._interruptible_sleep(remaining)
+
+    async def _interruptible_sleep(self, seconds: float) -> None:
+        """Sleep up to ``seconds``, returning early once stop is requested."""
+        stop_event = self._stop_event
+        assert stop_event is not None
+        if stop_event.is_set():
+            return
+        if sys.version_info >= (3, 11):
+            # Timeout context: no wrapper task, unlike wait_for on <3.12
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(seconds):
+                    await stop_event.wait()
+            return
+        # Python 3.10: one waiter task, cancelled if the timeout wins
+        waiter = asyncio.ensure_future(stop_event.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=seconds)
+        finally:
+            waiter.cancel()
+
+    async def run(self, config_path: Optional[str] = None) -> None:
+        """Entry point to run continuous monitoring until stopped."""
+        try:
+            config = Config.load_cached()
+        except Exception as e:
+            logging.getLogger(__name__).critical(
+                "Configuration load failed: %s", e, exc_info=True
+            )
+            sys.exit(2)
+
+        if not config.app_ids:
+            self.logger.warning("No app IDs configured; exiting.")
+            return
+
+        if self.logger.isEnabledFor(logging.INFO):
+            try:
+                self.logger.info("Configuration loaded: %s", config.to_dict())
+            except Exception:  # pragma: no cover - defensive
+                self.logger.debug("Config to_dict() failed", exc_info=True)
+
+        self.monitor = _monitor_class()(config)
+        self.running = True
+        # Create the stop event before handlers exist so an early signal
+        # is not lost between handler install and the first cycle.
+        self._stop_event = asyncio.Event()
+        self.setup_signal_handlers()
+
+        self.logger.info("TestFlight monitoring started")
+        try:
+            await self._monitor_loop(config)
+        finally:
+            self.remove_signal_handlers()
+            self.logger.info("TestFlight monitoring stopped")
+
+    # ---------------------------- Single Check -----------------------------
+    async def run_single_check(self, config_path: Optional[str]) -> int:
+        """Run a single availability check; return exit code."""
+        try:
+            config = Config.load_cached()
+        except Exception as e:
+            print(f"✗ Configuration error: {e}")
+            return 2
+
+        app_ids = config.app_ids
+        if not app_ids:
+            print("No app IDs configured.")
+            return 3
+
+        monitor = _monitor_class()(config)
+        exit_code = 0
+        out = sys.stdout
+        # Interactive: print each app as soon as its check finishes.
+        # Piped/redirected: collect and emit everything in one write.
+        stream = out.isatty()
+        lines: List[str] = []
+        async with monitor:
+            async for result in monitor.iter_check_apps(app_ids):
+                status = "Available" if result.get("available") else "Not Available"
+                if result.get("available"):
+                    exit_code = 0  # explicit for clarity
+                line = f"{result['app_id']}: {status}\n"
+                if stream:
+                    out.write(line)
+                    out.flush()
+                else:
+                    lines.append(line)
+        if lines:
+            out.write("".join(lines))
+        return exit_code
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> "argparse.ArgumentParser":
+    """Build the CLI parser once; argparse is imported on first use."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TestFlight Monitor")
+    parser.add_argument("--config", help="Path to config file")
+    parser.add_argument(
+        "--check",
+        "--once",
+        action="store_true",
+        help="Run single check and exit",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate configuration and exit",
+    )
+    parser.add_argument(
+        "--log-level",
+        dest="log_level",
+        help="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)",
+    )
+    parser.add_argument(
+        "--log-utc",
+        action="store_true",
+        help="Log timestamps in UTC (ISO 8601)",
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Emit structured JSON log lines",
+    )
+    parser.add_argument(
+        "--self-test",
+        action="store_true",
+        help=(
+            "Run a quick internal self-test (config load + one dry cycle) and " "exit"
+        ),
+    )
+    parser.add_argument(
+        "--version",
+        action="store_true",
+        help="Print version and exit",
+    )
+    return parser
+
+
+def main():
+    """CLI entry point with argument parsing."""
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    if args.version:
+        try:
+            from __init__ import __version__  # type: ignore
+        except Exception:  # pragma: no cover
+            __version__ = "unknown"
+        print(__version__)
+        return
+
+    if args.validate:
+        try:
+            config = Config.load_cached()
+            sys.stdout.write(
+                f"✓ Configuration is valid\nMonitoring {len(config.app_ids)} apps:\n"
+                + "".join(f"  - {app_id}\n" for app_id in config.app_ids)
+            )
+            return
+        except Exception as e:
+            print(f"✗ Configuration error: {e}")
+            sys.exit(2)
+
+    app = CLIApplication()
+    app.setup_logging(
+        level=args.log_level,
+        utc=args.log_utc,
+        json_logs=args.log_json,
+    )
+
+    # One event loop serves whichever mode runs below
+    with _loop_runner() as run:
+        if args.self_test:
+            # Minimal self-test: validate config and run one cycle with network
+            # disabled (network fetch monkeypatched to always return False)
+            try:  # noqa: BLE001 - intentional broad catch for user feedback
+                cfg = Config.load_cached()
+                app.monitor = _monitor_class()(cfg)
+                # Monkeypatch monitor network fetch to always return False quickly
+                if hasattr(app.monitor, "_fetch_availability"):
+
+                    async def _fake_fetch(app_id: str) -> bool:  # type: ignore
+                        return False
+
+                    setattr(app.monitor, "_fetch_availability", _fake_fetch)
+
+                async def run_once():
+                    async with app.monitor:  # type: ignore
+                        await app.monitor.run_cycle()  # type: ignore
+
+                run(run_once())
+                print("✓ Self-test passed")
+                sys.exit(0)
+            except Exception as e:  # noqa: BLE001 pragma: no cover
+                print(f"✗ Self-test failed: {e}")
+                sys.exit(5)
+
+        if args.check:
+            exit_code = run(app.run_single_check(config_path=args.config))
+            sys.exit(exit_code)
+
+        # Continuous monitoring
+        try:
+            run(app.run(config_path=args.config))
+        except KeyboardInterrupt:
+            # Already handled via signal; fallback for limited platforms
+            pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
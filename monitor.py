@@ -1,7 +1,13 @@
+import asyncio
+import hashlib
+import html
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import re
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import aiohttp
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from config import Config
 from notifications import NotificationManager
@@ -10,6 +16,50 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["TestFlightMonitor"]
 
+_POSITIVE_MARKERS = (
+    "join the beta",  # common CTA
+    "accepting testers",  # hypothetical phrasing
+    "beta signup",  # general
+    "open beta",  # general
+)
+_NEGATIVE_MARKERS = (
+    "beta is full",
+    "currently full",
+    "this beta is full",
+    "no longer accepting new testers",
+    "this beta isn't accepting",
+    "beta has ended",
+    "not available",
+    "unavailable",
+)
+# One case-insensitive pass per marker set instead of lower() + k scans.
+_POSITIVE_RE = re.compile("|".join(map(re.escape, _POSITIVE_MARKERS)), re.IGNORECASE)
+_NEGATIVE_RE = re.compile("|".join(map(re.escape, _NEGATIVE_MARKERS)), re.IGNORECASE)
+
+# Byte-level twin of _NEGATIVE_RE, used to stop reading a body early.
+_NEGATIVE_BYTES_RE = re.compile(
+    b"|".join(re.escape(m.encode()) for m in _NEGATIVE_MARKERS), re.IGNORECASE
+)
+_MARKER_OVERLAP = max(map(len, _NEGATIVE_MARKERS)) - 1
+_CHUNK_SIZE = 4096
+_MAX_BODY_BYTES = 512 * 1024
+# After an early stop, remainders up to this size are drained so the
+# keep-alive connection is reused; larger ones close it instead.
+_DRAIN_MAX_BYTES = 64 * 1024
+
+_JOIN_URL = "https://testflight.apple.com/join/"
+
+# Ceiling for the per-app retry delay after repeated failed fetches.
+_MAX_RETRY_DELAY = 3600.0
+
+# The app name rides along in the same join page as the availability
+# markers, so it is scraped from that response rather than fetched again.
+# Attribute order and quoting vary, so find the tag first, then its content.
+_OG_TITLE_RE = re.compile(
+    r"""<meta\b[^>]*?\bproperty\s*=\s*["']og:title["'][^>]*>""", re.IGNORECASE
+)
+_CONTENT_ATTR_RE = re.compile(r"""\bcontent\s*=\s*(["'])(.*?)\1""", re.IGNORECASE)
+
 
 class TestFlightMonitor:
     """Monitor TestFlight app codes for availability.
@@ -23,12 +73,38 @@ class TestFlightMonitor:
         self.config = config
         self._session: Optional[aiohttp.ClientSession] = None
         self.notification_manager = NotificationManager(config)
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = timedelta(minutes=config.cache_ttl_minutes)
+        # app_id -> (time.monotonic() of the check, result)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_ttl = config.cache_ttl_minutes * 60.0
+        # Bounds simultaneous page fetches so a long app list can't burst
+        # the TestFlight host.
+        self._fetch_slots = asyncio.Semaphore(config.max_concurrency)
+        # Join-page URLs are built once per configured code, not per fetch.
+        self._urls: Dict[str, str] = {a: _JOIN_URL + a for a in config.app_ids}
+        self._app_names: Dict[str, str] = {}
+        self._states: Dict[str, bool] = {}  # last reported verdict per app
+        # Conditional-request headers and the verdict they validate, per app.
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._last_available: Dict[str, bool] = {}
+        # Digest of the last parsed body and its verdict, per app.
+        self._parsed: Dict[str, Tuple[bytes, bool]] = {}
+        # Consecutive failed fetches and the monotonic time of the next
+        # allowed attempt, per app (see _note_fetch_failure).
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
 
     async def __aenter__(self) -> "TestFlightMonitor":
         timeout = aiohttp.ClientTimeout(total=30)
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        # Every request goes to the same host: pool connections to it, keep
+        # them alive between checks and cache its DNS answer.
+        connector = aiohttp.TCPConnector(
+            limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60
+        )
+        self._session = aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            headers={"User-Agent": "Mozilla/5.0"},
+        )
         return self
 
     async def __aexit__(self, *exc_info) -> None:
@@ -37,34 +113,72 @@ class TestFlightMonitor:
         self._session = None
 
     async def run_cycle(self) -> None:
-        """Run a single monitoring cycle over all configured app IDs."""
-        await self.check_multiple_apps(self.config.app_ids)
+        """Run a single monitoring cycle over all configured app IDs.
+
+        Apps that are backing off after failed fetches sit the cycle out.
+        """
+        app_ids = self.config.app_ids
+        if self._retry_at:
+            now = time.monotonic()
+            retry_at = self._retry_at
+            app_ids = [a for a in app_ids if retry_at.get(a, 0.0) <= now]
+            if len(app_ids) < len(self.config.app_ids):
+                logger.debug(
+                    "Skipping %d backing-off apps this cycle",
+                    len(self.config.app_ids) - len(app_ids),
+                )
+        await self.check_multiple_apps(app_ids)
 
     async def check_multiple_apps(self, app_ids: List[str]) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        for app_id in app_ids:
-            result = await self._check_single_app(app_id)
-            results.append(result)
-        return results
+        """Check apps concurrently; results follow the order of ``app_ids``."""
+        return list(
+            await asyncio.gather(*(self._check_single_app(a) for a in app_ids))
+        )
+
+    async def iter_check_apps(
+        self, app_ids: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Check apps concurrently, yielding each result as it completes."""
+        tasks = [asyncio.ensure_future(self._check_single_app(a)) for a in app_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled checks unwind before the caller closes the session
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _check_single_app(self, app_id: str) -> Dict[str, Any]:
-        now = datetime.now()
+        now = time.monotonic()
         # Cache check
         cached = self._cache.get(app_id)
-        if cached and (now - cached["timestamp"]) < self._cache_ttl:
-            return cached["data"]
+        if cached and now - cached[0] < self._cache_ttl:
+            return cached[1]
 
-        available = await self._fetch_availability(app_id)
+        async with self._fetch_slots:
+            available = await self._fetch_availability(app_id)
         data = {
             "app_id": app_id,
             "available": available,
-            "checked_at": now.isoformat(),
+            "name": self._app_names.get(app_id),
+            "checked_at": datetime.now().isoformat(),
         }
-        self._cache[app_id] = {"timestamp": now, "data": data}
+        self._cache[app_id] = (now, data)
+
+        # Log transitions only; a steady state is not news every cycle.
+        previous = self._states.get(app_id)
+        if available != previous:
+            self._states[app_id] = available
+            if available:
+                logger.info("Potential availability detected for %s", app_id)
+            elif previous:
+                logger.info("Availability closed for %s", app_id)
 
         if available:
+            label = data["name"] or app_id
             await self.notification_manager.send_notification(
-                title=f"TestFlight Slot Available: {app_id}",
+                title=f"TestFlight Slot Available: {label}",
                 message=f"An open slot was detected for {app_id}",
                 app_id=app_id,
             )
@@ -80,25 +194,86 @@ class TestFlightMonitor:
         - Expired/Not Available: various error phrases
         - Unknown: default to not available (False) to avoid false positives
         """
-        url = f"https://testflight.apple.com/join/{app_id}"
+        url = self._urls.get(app_id) or _JOIN_URL + app_id
         try:
             if not self._session:
                 raise RuntimeError("Session not initialized")
             async with self._session.get(
-                url, headers={"User-Agent": "Mozilla/5.0"}
+                url, headers=self._validators.get(app_id)
             ) as resp:
+                if resp.status == 304 and app_id in self._last_available:
+                    self._note_fetch_success(app_id)
+                    return self._last_available[app_id]
                 if resp.status != 200:
                     logger.debug("App %s page status %s", app_id, resp.status)
+                    self._note_fetch_failure(app_id)
                     return False
-                text = await resp.text()
-                available = self._interpret_page(text)
-                if available:
-                    logger.info("Potential availability detected for %s", app_id)
+                self._note_fetch_success(app_id)
+                body = await _read_page(resp)
+                available = self._parse_body(app_id, body, resp.charset)
+                self._remember_validators(app_id, resp.headers, available)
                 return available
         except Exception as e:  # noqa: BLE001
             logger.warning("Fetch failed for %s: %s", app_id, e)
+            self._note_fetch_failure(app_id)
             return False
 
+    def _note_fetch_success(self, app_id: str) -> None:
+        if self._failures:
+            self._failures.pop(app_id, None)
+            self._retry_at.pop(app_id, None)
+
+    def _note_fetch_failure(self, app_id: str) -> None:
+        """Back off polling of an app whose page keeps failing to load.
+
+        From the second consecutive failure the app waits
+        ``check_interval * 2**(n-1)`` seconds (capped at an hour, +-10%
+        jitter) before its next attempt. Pages that load but read "full" are
+        never backed off, so an opening is still caught on the next cycle.
+        """
+        failures = self._failures.get(app_id, 0) + 1
+        self._failures[app_id] = failures
+        if failures < 2:
+            return
+        delay = min(
+            _MAX_RETRY_DELAY,
+            self.config.check_interval_seconds * 2 ** (failures - 1),
+        )
+        self._retry_at[app_id] = time.monotonic() + delay * random.uniform(0.9, 1.1)
+
+    def _parse_body(self, app_id: str, body: bytes, charset: Optional[str]) -> bool:
+        """Interpret a join page, skipping the parse if the body is unchanged."""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        parsed = self._parsed.get(app_id)
+        if parsed and parsed[0] == digest:
+            return parsed[1]
+        text = body.decode(charset or "utf-8", "replace")
+        tag = _OG_TITLE_RE.search(text)
+        content = tag and _CONTENT_ATTR_RE.search(tag.group())
+        if content:
+            self._app_names[app_id] = html.unescape(content.group(2))
+        available = self._interpret_page(text)
+        self._parsed[app_id] = (digest, available)
+        return available
+
+    def _remember_validators(
+        self, app_id: str, headers: Any, available: bool
+    ) -> None:
+        """Store ETag/Last-Modified so the next fetch can be answered by a 304."""
+        validators: Dict[str, str] = {}
+        etag = headers.get("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = headers.get("Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        if validators:
+            self._validators[app_id] = validators
+            self._last_available[app_id] = available
+        else:
+            self._validators.pop(app_id, None)
+            self._last_available.pop(app_id, None)
+
     # -------- Heuristic Parser (exposed for testing) --------------------
     def _interpret_page(self, html: str) -> bool:
         """Return True if page content strongly indicates open slots.
@@ -106,28 +281,9 @@ class TestFlightMonitor:
         Conservative: only return True on positive signals; ambiguous text
         yields False. This function is pure & testable.
         """
-        lowered = html.lower()
-        positive_markers = [
-            "join the beta",  # common CTA
-            "accepting testers",  # hypothetical phrasing
-            "beta signup",  # general
-            "open beta",  # general
-        ]
-        negative_markers = [
-            "beta is full",
-            "currently full",
-            "this beta is full",
-            "no longer accepting new testers",
-            "this beta isn't accepting",
-            "beta has ended",
-            "not available",
-            "unavailable",
-        ]
-        if any(n in lowered for n in negative_markers):
+        if _NEGATIVE_RE.search(html):
             return False
-        if any(p in lowered for p in positive_markers):
-            return True
-        return False
+        return _POSITIVE_RE.search(html) is not None
 
     # Public wrapper for tests / external diagnostics
     def interpret_page(self, html: str) -> bool:
@@ -135,5 +291,44 @@ class TestFlightMonitor:
         return self._interpret_page(html)
 
 
+async def _read_page(resp: aiohttp.ClientResponse) -> bytes:
+    """Read a join page body, stopping as soon as a negative marker shows up.
+
+    A negative marker settles the verdict on its own, so the rest of the page
+    is not kept. Bodies are capped at ``_MAX_BODY_BYTES``.
+
+    Closing the response mid-body also drops its keep-alive connection, and
+    the next fetch pays for a fresh TCP/TLS handshake. That only wins when a
+    lot of the body is left, so a remainder of at most ``_DRAIN_MAX_BYTES``
+    (by Content-Length, or counted while reading when it is unknown) is read
+    and discarded, and the connection is released back to the pool.
+    """
+    buf = bytearray()
+    chunks = resp.content.iter_chunked(_CHUNK_SIZE)
+    async for chunk in chunks:
+        # Rescan a marker's length of the previous tail so that markers split
+        # across chunk boundaries are still found.
+        start = max(0, len(buf) - _MARKER_OVERLAP)
+        buf += chunk
+        if _NEGATIVE_BYTES_RE.search(buf, start) or len(buf) >= _MAX_BODY_BYTES:
+            break
+    else:
+        return bytes(buf)
+
+    length = resp.content_length
+    if length is not None and length - len(buf) > _DRAIN_MAX_BYTES:
+        resp.close()
+        return bytes(buf)
+    drained = 0
+    async for chunk in chunks:
+        drained += len(chunk)
+        if drained > _DRAIN_MAX_BYTES:
+            resp.close()
+            break
+    else:
+        resp.release()
+    return bytes(buf)
+
+
 # Prevent pytest from trying to collect TestFlightMonitor as a test class
 TestFlightMonitor.__test__ = False  # type: ignore[attr-defined]
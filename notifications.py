@@ -1,123 +1,274 @@
+import asyncio
+import functools
 import logging
 import os
-import apprise
-from typing import Optional
-from datetime import datetime
+import re
+import time
+from urllib.parse import urlencode
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from config import Config  # type: ignore
 
+if TYPE_CHECKING:  # apprise is imported on first use; see _apprise_for
+    import apprise
+
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer env var, falling back to ``default`` if unset/invalid."""
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+# Manager settings are process-wide, so the env is read once at import
+_COOLDOWN_SECONDS = _env_int("TFM_NOTIFY_COOLDOWN", 600)
+_BATCH_WINDOW_SECONDS = _env_int("TFM_NOTIFY_BATCH_MS", 0) / 1000
+
+# Webhook ID and token from a https://discord.com/api/webhooks/<id>/<token> URL
+_DISCORD_RE = re.compile(r"discord\.com/api/webhooks/(?P<id>\d+)/(?P<token>[\w-]+)")
+
+# (service list, Apprise instance) most recently built by _apprise_for;
+# managers with the same endpoints share the instance instead of re-adding.
+_LAST_APPRISE: Optional[Tuple[Tuple[Tuple[str, str], ...], "apprise.Apprise"]] = None
+
+
+def _apprise_for(services: Tuple[Tuple[str, str], ...]) -> "apprise.Apprise":
+    """Return an Apprise object for ``(label, url)`` services, reusing the last.
+
+    URLs are parsed and plugins instantiated only when the service list
+    differs from the one the cached instance was built for. apprise itself
+    (a heavy import) is loaded here, so runs without services never pay it.
+    """
+    global _LAST_APPRISE
+    if _LAST_APPRISE is not None and _LAST_APPRISE[0] == services:
+        return _LAST_APPRISE[1]
+    import apprise
+
+    apprise_obj = apprise.Apprise()
+    # One add() for the whole list; Apprise keeps the valid entries even when
+    # another one is rejected
+    labels = ", ".join(label for label, _ in services)
+    if apprise_obj.add([url for _, url in services]):
+        logger.info("Notifications configured: %s", labels)
+    else:
+        logger.warning("Some notification URLs were rejected (%s)", labels)
+    _LAST_APPRISE = (services, apprise_obj)
+    return apprise_obj
+
+
+@functools.lru_cache(maxsize=16)
+def _build_service_urls(
+    discord_webhook_url: Optional[str],
+    slack_webhook_url: Optional[str],
+    email_smtp_server: Optional[str],
+    email_smtp_port: int,
+    email_username: Optional[str],
+    email_password: Optional[str],
+    email_recipients: Optional[Tuple[str, ...]],
+    pushover_user_key: Optional[str],
+    pushover_api_token: Optional[str],
+    pushover_priority: Optional[str],
+    pushover_sound: Optional[str],
+) -> Tuple[Tuple[str, str], ...]:
+    """Build ``(label, apprise URL)`` pairs; memoized on the settings."""
+    services: List[Tuple[str, str]] = []
+
+    # Add Discord webhook if configured
+    if discord_webhook_url:
+        match = _DISCORD_RE.search(discord_webhook_url)
+        if match:
+            services.append(("Discord", f"discord://{match['id']}/{match['token']}"))
+
+    # Add Slack webhook if configured
+    if slack_webhook_url:
+        services.append(("Slack", slack_webhook_url))
+
+    # Add email if configured
+    if email_smtp_server:
+        email_url = (
+            f"mailto://{email_username}:{email_password}@"
+            f"{email_smtp_server}:{email_smtp_port}"
+        )
+
+        # Add recipients
+        if email_recipients:
+            email_url += f"?to={','.join(email_recipients)}"
+
+        services.append(("Email", email_url))
+
+    # Add Pushover last (independent)
+    if pushover_user_key and pushover_api_token:
+        # Pushover URL format; option values are percent-encoded
+        params = {
+            key: value
+            for key, value in (
+                ("priority", pushover_priority),
+                ("sound", pushover_sound),
+            )
+            if value
+        }
+        query = f"?{urlencode(params)}" if params else ""
+        services.append(
+            ("Pushover", f"pushover://{pushover_user_key}@{pushover_api_token}/{query}")
+        )
+
+    return tuple(services)
+
+
+def _combine(batch: List[Tuple[str, str]]) -> Tuple[str, str]:
+    """Merge queued ``(title, message)`` pairs into one notification."""
+    if len(batch) == 1:
+        return batch[0]
+    title = f"{batch[0][0]} (+{len(batch) - 1} more)"
+    return title, "\n\n".join(f"{t}\n{m}" for t, m in batch)
+
+
 class NotificationManager:
     """Manages notifications via Apprise with per-app cooldown.
 
     Default cooldown 600 seconds; override with env var TFM_NOTIFY_COOLDOWN.
+    Batching is opt-in: with TFM_NOTIFY_BATCH_MS > 0, notifications raised
+    within that many ms of each other are delivered as one combined message.
+    It is off by default because the window delays every delivery.
     """
 
     def __init__(self, config: Config):  # type: ignore[name-defined]
         self.config = config
-        self.apprise_obj = apprise.Apprise()
-        self.last_notification: dict[str, datetime] = {}
-        # Cooldown seconds per app (default 600); allow override via env
-        try:
-            self.cooldown = int(os.getenv("TFM_NOTIFY_COOLDOWN", "600"))
-        except Exception:  # pragma: no cover
-            self.cooldown = 600
+        # app_id -> time.monotonic() of the last send, oldest first; entries
+        # past the cooldown are pruned on each send (see _record_send)
+        self.last_notification: dict[str, float] = {}
+        # Cooldown seconds per app and batch window; see _COOLDOWN_SECONDS
+        self.cooldown = _COOLDOWN_SECONDS
+        self.batch_window = _BATCH_WINDOW_SECONDS
+        # Notifications queued in the currently open batch window, and the
+        # task that delivers them once the window closes
+        self._batch: Optional[List[Tuple[str, str]]] = None
+        self._batch_task: Optional["asyncio.Task[None]"] = None
         self._setup_notifications()
 
     def _setup_notifications(self) -> None:
         """Setup Apprise notification endpoints."""
-        added_count = 0
-
-        # Add Discord webhook if configured
-        if self.config.notifications.discord_webhook_url:
-            # Extract webhook ID and token from Discord URL
-            webhook_url = self.config.notifications.discord_webhook_url
-            if "discord.com/api/webhooks/" in webhook_url:
-                webhook_parts = webhook_url.split("/")[-2:]
-                apprise_url = f"discord://{webhook_parts[0]}/{webhook_parts[1]}"
-                if self.apprise_obj.add(apprise_url):  # type: ignore[arg-type]
-                    added_count += 1
-                    logger.info("Discord notification configured")
-
-        # Add Slack webhook if configured
-        if self.config.notifications.slack_webhook_url:
-            slack_url = self.config.notifications.slack_webhook_url
-            if self.apprise_obj.add(slack_url):  # type: ignore[arg-type]
-                added_count += 1
-                logger.info("Slack notification configured")
-
-        # Add email if configured
-        if self.config.notifications.email_smtp_server:
-            email_url = (
-                f"mailto://{self.config.notifications.email_username}:"
-                f"{self.config.notifications.email_password}@"
-                f"{self.config.notifications.email_smtp_server}:"
-                f"{self.config.notifications.email_smtp_port}"
-            )
+        services = self._service_urls()
+        # Without services there is nothing to deliver to: skip apprise entirely
+        apprise_obj = _apprise_for(services) if services else None
+        self.service_count = len(apprise_obj) if apprise_obj is not None else 0
+        # None (also when Apprise rejected every URL) makes send_notification
+        # return before any rate-limit bookkeeping or delivery attempt
+        self.apprise_obj = apprise_obj if self.service_count else None
+        logger.info("Configured %d notification services", self.service_count)
+
+    def _service_urls(self) -> Tuple[Tuple[str, str], ...]:
+        """Return ``(label, apprise URL)`` for every configured service."""
+        n = self.config.notifications
+        recipients = n.email_recipients
+        return _build_service_urls(
+            n.discord_webhook_url,
+            n.slack_webhook_url,
+            n.email_smtp_server,
+            n.email_smtp_port,
+            n.email_username,
+            n.email_password,
+            tuple(recipients) if recipients else None,
+            n.pushover_user_key,
+            n.pushover_api_token,
+            n.pushover_priority,
+            n.pushover_sound,
+        )
 
-            # Add recipients
-            if self.config.notifications.email_recipients:
-                recipients = ",".join(self.config.notifications.email_recipients)
-                email_url += f"?to={recipients}"
-
-            # Add email endpoint
-            if self.apprise_obj.add(email_url):  # type: ignore[arg-type]
-                added_count += 1
-                logger.info("Email notification configured")
-
-        # Add Pushover last (independent)
-        pu = self.config.notifications
-        if pu.pushover_user_key and pu.pushover_api_token:
-            # Pushover URL format
-            base = f"pushover://{pu.pushover_user_key}" f"@{pu.pushover_api_token}/"
-            params: list[str] = []
-            if pu.pushover_priority:
-                params.append(f"priority={pu.pushover_priority}")
-            if pu.pushover_sound:
-                params.append(f"sound={pu.pushover_sound}")
-            if params:
-                base = base + "?" + "&".join(params)
-            if self.apprise_obj.add(base):  # type: ignore[arg-type]
-                added_count += 1
-                logger.info("Pushover notification configured")
-
-        # Final count log
-        logger.info("Configured %d notification services", added_count)
+    def _record_send(self, app_id: str, now: float) -> None:
+        """Record a send for ``app_id`` and drop entries past the cooldown.
+
+        Entries are kept in send order, so expired ones sit at the front and
+        the map stays bounded by the apps notified within one cooldown.
+        """
+        sent = self.last_notification
+        cutoff = now - self.cooldown
+        expired = []
+        for key, sent_at in sent.items():
+            if sent_at > cutoff:
+                break
+            expired.append(key)
+        for key in expired:
+            del sent[key]
+        sent.pop(app_id, None)
+        sent[app_id] = now
 
     async def send_notification(
         self, title: str, message: str, app_id: Optional[str] = None
     ) -> None:
         """Send notification through all configured Apprise services."""
+        if self.apprise_obj is None:
+            return
         # Rate limiting
-        if app_id:
-            now = datetime.now()
+        if app_id is not None:
+            now = time.monotonic()
             last_sent = self.last_notification.get(app_id)
-            if last_sent and (now - last_sent).total_seconds() < self.cooldown:
+            if last_sent is not None and now - last_sent < self.cooldown:
                 logger.info("Skipping notification for %s - rate limited", app_id)
                 return
-            self.last_notification[app_id] = now
+            self._record_send(app_id, now)
+
+        if self.batch_window <= 0:
+            await self._deliver(title, message)
+            return
+        if self._batch is not None:
+            self._batch.append((title, message))
+        else:
+            batch = self._batch = [(title, message)]
+            self._batch_task = asyncio.ensure_future(self._flush_batch(batch))
+        # Delivery runs in its own task, so a cancelled caller (including
+        # the one that opened the batch) cannot drop queued notifications
+        await asyncio.shield(self._batch_task)  # type: ignore[arg-type]
 
+    async def _flush_batch(self, batch: List[Tuple[str, str]]) -> None:
+        """Deliver ``batch`` as one notification once the window closes."""
         try:
-            # Send notification through all configured services
-            # Prepare and send notification
-            # type: ignore[attr-defined]
-            success = self.apprise_obj.notify(  # type: ignore[call-arg]
-                title=title,
-                body=message,
-                notify_type=apprise.NotifyType.SUCCESS,
+            await asyncio.sleep(self.batch_window)
+        except asyncio.CancelledError:
+            logger.warning(
+                "Dropped batched notifications: %s", ", ".join(t for t, _ in batch)
             )
+            raise
+        finally:
+            self._batch = None
+        await self._deliver(*_combine(batch))
+
+    async def _deliver(self, title: str, message: str) -> None:
+        """Send one notification through all configured Apprise services."""
+        import apprise  # already loaded by _apprise_for
+
+        apprise_obj = self.apprise_obj
+        assert apprise_obj is not None  # send_notification checks first
+        notify_type = apprise.NotifyType.SUCCESS
+        try:
+            async_notify = getattr(apprise_obj, "async_notify", None)
+            if async_notify is not None:
+                # Fans out to all services at once without blocking the loop
+                success = await async_notify(
+                    title=title, body=message, notify_type=notify_type
+                )
+            else:
+                # Older Apprise: blocking delivery, so keep it off the loop
+                success = await asyncio.to_thread(
+                    functools.partial(
+                        apprise_obj.notify,
+                        title=title,
+                        body=message,
+                        notify_type=notify_type,
+                    )
+                )
 
             if success:
                 logger.info("Notification sent successfully: %s", title)
             else:
                 logger.error("Failed to send notification: %s", title)
 
-        except apprise.AppriseException as e:  # type: ignore[attr-defined]
-            msg = f"Error sending notification: {e}"
-            logger.error(msg)
+        # AppriseException is not exported by every Apprise release
+        except getattr(apprise, "AppriseException", ()) as e:
+            logger.error("Error sending notification: %s", e)
         except Exception as e:  # pragma: no cover
             # Fallback to avoid crashing caller on unexpected errors
-            msg = f"Unexpected error sending notification: {e}"
-            logger.error(msg)
+            logger.error("Unexpected error sending notification: %s", e)
@@ -1,10 +1,30 @@
 import asyncio
+from typing import List, Optional, Tuple
 from config import Config
 import os
+import pytest
 from monitor import TestFlightMonitor
 from main import CLIApplication
 
 
+@pytest.fixture(autouse=True)
+def _fresh_env_snapshot():
+    # Config snapshots env vars per process; isolate tests from each other
+    Config.invalidate_env_cache()
+    yield
+    Config.invalidate_env_cache()
+
+
+@pytest.fixture
+def notifier():
+    # Batching off (even if TFM_NOTIFY_BATCH_MS is set) so sends return at once
+    from notifications import NotificationManager
+
+    manager = NotificationManager(Config(app_ids=["FAKE"]))
+    manager.batch_window = 0
+    return manager
+
+
 def test_monitor_cycle_basic() -> None:
     cfg = Config(app_ids=["FAKECODE"])
 
@@ -44,6 +64,9 @@ def test_cli_single_check() -> None:
             async def check_multiple_apps(self, app_ids):  # type: ignore
                 return [{"app_id": a, "available": False} for a in app_ids]
 
+            async def _fetch_availability(self, app_id):  # type: ignore
+                return False
+
         # Swap symbol in imported module
         main_module.TestFlightMonitor = FakeMonitor  # type: ignore
         try:
@@ -69,6 +92,9 @@ def test_interpret_page_heuristics() -> None:
     assert monitor.interpret_page(positive) is True
     assert monitor.interpret_page(negative) is False
     assert monitor.interpret_page(ambiguous) is False
+    # Overlapping markers: the negative must still win over "open beta"
+    assert monitor.interpret_page("Open Beta is full") is False
+    assert monitor.interpret_page("JOIN THE BETA") is True
 
 
 def test_cli_version_flag(capsys=None) -> None:  # type: ignore[no-untyped-def]
@@ -99,6 +125,7 @@ def test_monitor_backoff_behavior() -> None:
         def __init__(self):
             self.attempts = 0
             self.entered = False
+            self.succeeded = asyncio.Event()
 
         async def __aenter__(self):
             self.entered = True
@@ -112,6 +139,7 @@ def test_monitor_backoff_behavior() -> None:
             if self.attempts < 3:
                 raise RuntimeError("fail")
             # succeed silently on 3rd attempt
+            self.succeeded.set()
 
     class StubConfig:
         check_interval_seconds = 1
@@ -126,14 +154,534 @@ def test_monitor_backoff_behavior() -> None:
         task = asyncio.create_task(
             app._monitor_loop(StubConfig())  # type: ignore[arg-type]
         )
-        # Wait until 3 attempts or timeout
-        for _ in range(60):
-            if app.monitor.attempts >= 3:  # type: ignore[attr-defined]
-                app.request_stop()
-                break
-            await asyncio.sleep(0.05)
+        # Stop as soon as the third attempt succeeds
+        await asyncio.wait_for(
+            app.monitor.succeeded.wait(), timeout=5  # type: ignore[attr-defined]
+        )
+        app.request_stop()
         await asyncio.wait_for(task, timeout=5)
         return app.monitor.attempts  # type: ignore[attr-defined]
 
     attempts = asyncio.run(run())
     assert attempts >= 3
+
+
+def test_config_file_cache_invalidates_on_change(tmp_path, monkeypatch) -> None:
+    import json
+    import os
+
+    monkeypatch.delenv("TESTFLIGHT_APP_IDS", raising=False)
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"app_ids": ["FIRSTCODE"]}))
+    assert Config().app_ids == ["FIRSTCODE"]
+
+    path.write_text(json.dumps({"app_ids": ["SECONDCODE"]}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert Config().app_ids == ["SECONDCODE"]
+
+
+def test_config_file_schema_rejects_wrong_types() -> None:
+    from config import _FILE_SCHEMA, _NOTIF_SCHEMA, _check_schema
+
+    _check_schema({"app_ids": ["CODE"], "unknown": 1}, _FILE_SCHEMA)
+    with pytest.raises(ValueError, match="cache_ttl_minutes"):
+        _check_schema({"cache_ttl_minutes": "5"}, _FILE_SCHEMA)
+    with pytest.raises(ValueError, match="app_ids"):
+        _check_schema({"app_ids": ["CODE", 3]}, _FILE_SCHEMA)
+    with pytest.raises(ValueError, match="notifications.email_smtp_port"):
+        _check_schema({"email_smtp_port": True}, _NOTIF_SCHEMA, "notifications.")
+
+
+def test_split_csv_strips_and_drops_blanks() -> None:
+    from config import _split_csv
+
+    assert _split_csv(" AAAA, ,BBBB,,") == ["AAAA", "BBBB"]
+    assert _split_csv("") == []
+
+
+def test_config_skip_file_env(tmp_path, monkeypatch) -> None:
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text(json.dumps({"cache_ttl_minutes": 9}))
+    monkeypatch.setenv("TESTFLIGHT_APP_IDS", "ENVCODE")
+    Config.invalidate_env_cache()
+    assert Config().cache_ttl_minutes == 9
+    # Even with every variable set the file is still read and wins
+    from config import _ENV_SPEC
+
+    for key, _, _, cast in _ENV_SPEC:
+        if key != "TESTFLIGHT_APP_IDS":
+            monkeypatch.setenv(key, "3" if cast is int else "x")
+    Config.invalidate_env_cache()
+    assert Config().cache_ttl_minutes == 9
+    monkeypatch.setenv("TFM_SKIP_CONFIG_FILE", "1")
+    Config.invalidate_env_cache()
+    assert Config().cache_ttl_minutes == 3
+
+
+def test_config_load_cached_tracks_env(monkeypatch) -> None:
+    monkeypatch.setenv("TESTFLIGHT_APP_IDS", "CACHEONE")
+    first = Config.load_cached()
+    assert Config.load_cached() is first
+    monkeypatch.setenv("TESTFLIGHT_APP_IDS", "CACHETWO")
+    second = Config.load_cached()
+    assert second is not first
+    assert second.app_ids == ["CACHETWO"]
+
+
+def test_config_schema_matches_dataclass_fields() -> None:
+    from config import _FILE_SCHEMA, _NOTIF_FIELDS, _NOTIF_SCHEMA, _SCALAR_FIELDS
+
+    assert set(_NOTIF_SCHEMA) == _NOTIF_FIELDS
+    assert set(_FILE_SCHEMA) == _SCALAR_FIELDS | {"app_ids", "notifications"}
+
+
+def test_config_env_snapshot_requires_invalidation(monkeypatch) -> None:
+    monkeypatch.setenv("TESTFLIGHT_APP_IDS", "SNAPONE")
+    Config.invalidate_env_cache()
+    assert Config().app_ids == ["SNAPONE"]
+    monkeypatch.setenv("TESTFLIGHT_APP_IDS", "SNAPTWO")
+    assert Config().app_ids == ["SNAPONE"]
+    Config.invalidate_env_cache()
+    assert Config().app_ids == ["SNAPTWO"]
+
+
+def test_iter_check_apps_yields_in_completion_order() -> None:
+    cfg = Config(app_ids=["SLOWCODE", "FASTCODE"])
+
+    async def run():
+        monitor = TestFlightMonitor(cfg)
+
+        async def fake_fetch(app_id: str) -> bool:
+            await asyncio.sleep(0.05 if app_id == "SLOWCODE" else 0)
+            return False
+
+        monitor._fetch_availability = fake_fetch  # type: ignore
+        async with monitor:
+            return [r["app_id"] async for r in monitor.iter_check_apps(cfg.app_ids)]
+
+    assert asyncio.run(run()) == ["FASTCODE", "SLOWCODE"]
+
+
+def test_iter_check_apps_early_exit_awaits_pending() -> None:
+    import contextlib
+
+    cfg = Config(app_ids=["SLOWCODE", "FASTCODE"])
+    unwound = []
+
+    async def run():
+        monitor = TestFlightMonitor(cfg)
+
+        async def fake_fetch(app_id: str) -> bool:
+            try:
+                await asyncio.sleep(0 if app_id == "FASTCODE" else 10)
+            except asyncio.CancelledError:
+                unwound.append(app_id)
+                raise
+            return False
+
+        monitor._fetch_availability = fake_fetch  # type: ignore
+        async with monitor:
+            gen = monitor.iter_check_apps(cfg.app_ids)
+            async with contextlib.aclosing(gen):
+                async for result in gen:
+                    break
+            # The slow check finished unwinding before aclose() returned
+            return result["app_id"], list(unwound)
+
+    assert asyncio.run(run()) == ("FASTCODE", ["SLOWCODE"])
+
+
+def test_json_formatter_output_is_valid_json() -> None:
+    import json
+    import logging
+    from main import _JSONFormatter
+
+    record = logging.LogRecord(
+        "tfm", logging.INFO, __file__, 1, 'say "%s"\n', ("héllo",), None
+    )
+    parsed = json.loads(_JSONFormatter(utc=True).format(record))
+    assert parsed["msg"] == 'say "héllo"\n'
+    assert parsed["level"] == "INFO"
+    assert parsed["ts"].endswith("Z")
+
+
+def test_request_stop_cancels_in_flight_cycle() -> None:
+    class HangingMonitor:
+        cancelled = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def run_cycle(self):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                HangingMonitor.cancelled = True
+                raise
+
+    class StubConfig:
+        check_interval_seconds = 60
+        app_ids = ["FAKE"]
+
+    async def run():
+        app = CLIApplication()
+        app.monitor = HangingMonitor()  # type: ignore
+        app.running = True
+        task = asyncio.create_task(
+            app._monitor_loop(StubConfig())  # type: ignore[arg-type]
+        )
+        await asyncio.sleep(0.05)
+        app.request_stop()
+        await asyncio.wait_for(task, timeout=2)
+
+    asyncio.run(run())
+    assert HangingMonitor.cancelled
+
+
+class _FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    charset = "utf-8"
+    content_length: Optional[int] = None
+    closed = released = False
+
+    @property
+    def content(self):
+        return self
+
+    async def iter_chunked(self, size):
+        self.chunks_read = 0
+        for i in range(0, len(self._body), size):
+            self.chunks_read += 1
+            yield self._body[i : i + size]
+
+    def close(self):
+        self.closed = True
+
+    def release(self):
+        self.released = True
+
+
+class _FakeSession:
+    """Replays canned responses and records the headers of each request."""
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None):
+        self.sent_headers.append(headers)
+        return self._responses.pop(0)
+
+
+def test_fetch_revalidates_with_etag() -> None:
+    page = (
+        b'<meta property="og:title" content="Some &amp; App">'
+        b"<a>Join the Beta</a>"
+    )
+    session = _FakeSession(
+        _FakeResponse(200, page, {"ETag": '"v1"'}),
+        _FakeResponse(304),
+    )
+    monitor = TestFlightMonitor(Config(app_ids=["FAKECODE"]))
+    monitor._session = session  # type: ignore[assignment]
+
+    first = asyncio.run(monitor._fetch_availability("FAKECODE"))
+    second = asyncio.run(monitor._fetch_availability("FAKECODE"))
+    assert first is True and second is True
+    assert session.sent_headers == [None, {"If-None-Match": '"v1"'}]
+    assert monitor._app_names["FAKECODE"] == "Some & App"
+
+
+def test_unchanged_body_is_not_reparsed() -> None:
+    monitor = TestFlightMonitor(Config(app_ids=["FAKECODE"]))
+    calls = []
+
+    def counting_interpret(html):
+        calls.append(html)
+        return False
+
+    monitor._interpret_page = counting_interpret  # type: ignore[assignment]
+    monitor._parse_body("FAKECODE", b"This beta is full", "utf-8")
+    monitor._parse_body("FAKECODE", b"This beta is full", "utf-8")
+    monitor._parse_body("FAKECODE", b"Join the beta", "utf-8")
+    assert len(calls) == 2
+
+
+def test_og_title_any_attribute_order() -> None:
+    monitor = TestFlightMonitor(Config(app_ids=["FAKECODE"]))
+    page = b"<META content='Reordered' data-x=1 property='og:title'>"
+    monitor._parse_body("FAKECODE", page, None)
+    assert monitor._app_names["FAKECODE"] == "Reordered"
+
+
+def test_read_page_stops_at_negative_marker() -> None:
+    from monitor import _CHUNK_SIZE, _DRAIN_MAX_BYTES, _read_page
+
+    # Marker straddles the first chunk boundary; a large tail is never read.
+    head = b"x" * (_CHUNK_SIZE - 6) + b"This Beta is Full"
+    page = head + b"y" * (_DRAIN_MAX_BYTES * 2)
+    resp = _FakeResponse(200, page)
+    resp.content_length = len(page)
+    body = asyncio.run(_read_page(resp))  # type: ignore[arg-type]
+    assert resp.chunks_read == 2 and resp.closed and not resp.released
+    assert body.startswith(head) and len(body) == 2 * _CHUNK_SIZE
+
+    # A short tail is drained so the connection can be reused.
+    resp = _FakeResponse(200, head + b"y" * (_CHUNK_SIZE * 4))
+    body = asyncio.run(_read_page(resp))  # type: ignore[arg-type]
+    assert resp.released and not resp.closed
+    assert len(body) == 2 * _CHUNK_SIZE
+
+
+def test_check_multiple_apps_bounds_concurrency() -> None:
+    codes = ["CODE1", "CODE2", "CODE3", "CODE4", "CODE5"]
+    monitor = TestFlightMonitor(Config(app_ids=codes, max_concurrency=2))
+    in_flight = peak = 0
+
+    async def fake_fetch(app_id: str) -> bool:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return False
+
+    monitor._fetch_availability = fake_fetch  # type: ignore
+    results = asyncio.run(monitor.check_multiple_apps(codes))
+    assert [r["app_id"] for r in results] == codes
+    assert peak == 2
+
+
+def test_failing_app_backs_off_until_success() -> None:
+    monitor = TestFlightMonitor(Config(app_ids=["GOOD", "BROKEN"]))
+    fetched = []
+
+    async def fake_fetch(app_id: str) -> bool:
+        fetched.append(app_id)
+        return False
+
+    monitor._fetch_availability = fake_fetch  # type: ignore
+    monitor._note_fetch_failure("BROKEN")
+    monitor._note_fetch_failure("BROKEN")
+    asyncio.run(monitor.run_cycle())
+    assert fetched == ["GOOD"]
+
+    monitor._note_fetch_success("BROKEN")
+    monitor._cache.clear()
+    asyncio.run(monitor.run_cycle())
+    assert sorted(fetched[1:]) == ["BROKEN", "GOOD"]
+
+
+def test_notification_managers_share_apprise_object() -> None:
+    from notifications import NotificationManager
+
+    def manager(url):
+        cfg = Config(app_ids=["FAKE"])
+        cfg.notifications.slack_webhook_url = url
+        return NotificationManager(cfg)
+
+    first = manager("slack://T1/B1/C1")
+    assert manager("slack://T1/B1/C1").apprise_obj is first.apprise_obj
+    assert manager("slack://T2/B2/C2").apprise_obj is not first.apprise_obj
+
+
+def test_send_notification_does_not_block_loop(notifier) -> None:
+    import time
+
+    class SlowApprise:
+        def notify(self, **kwargs):
+            time.sleep(0.2)
+            return True
+
+    notifier.apprise_obj = SlowApprise()  # type: ignore[assignment]
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await notifier.send_notification("t", "m", app_id="FAKE")
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) > 5
+
+
+def test_check_single_app_with_mocked_session() -> None:
+    page = b'<meta property="og:title" content="Demo"><a>Join the beta</a>'
+    session = _FakeSession(_FakeResponse(200, page))
+    monitor = TestFlightMonitor(Config(app_ids=["FAKECODE"]))
+    monitor._session = session  # type: ignore[assignment]
+    sent = []
+
+    async def fake_send(title, message, app_id=None):
+        sent.append(title)
+
+    monitor.notification_manager.send_notification = fake_send  # type: ignore
+
+    async def run():
+        first = await monitor._check_single_app("FAKECODE")
+        second = await monitor._check_single_app("FAKECODE")  # cache hit
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["available"] is True and first["name"] == "Demo"
+    assert second is first and len(session.sent_headers) == 1
+    assert sent == ["TestFlight Slot Available: Demo"]
+
+
+def test_send_notification_prefers_async_notify(notifier) -> None:
+    class AsyncApprise:
+        calls = []
+
+        def notify(self, **kwargs):  # pragma: no cover - must not be used
+            raise AssertionError("blocking notify called")
+
+        async def async_notify(self, **kwargs):
+            self.calls.append(kwargs["title"])
+            return True
+
+    notifier.apprise_obj = AsyncApprise()  # type: ignore[assignment]
+    asyncio.run(notifier.send_notification("t", "m", app_id="FAKE"))
+    assert AsyncApprise.calls == ["t"]
+
+
+def test_last_notification_prunes_expired_entries(notifier) -> None:
+    notifier.cooldown = 10
+    for i, app_id in enumerate(["A", "B", "C"]):
+        notifier._record_send(app_id, float(i))
+    notifier._record_send("D", 11.5)  # A (t=0) and B (t=1) have expired
+    assert list(notifier.last_notification) == ["C", "D"]
+
+
+def test_discord_webhook_url_parsing() -> None:
+    from notifications import _build_service_urls
+
+    def discord(url):
+        return _build_service_urls(url, *[None] * 2, 587, *[None] * 7)
+
+    expected = (("Discord", "discord://123/abc-DEF_9"),)
+    base = "https://discord.com/api/webhooks/123/abc-DEF_9"
+    assert discord(base) == expected
+    assert discord(base + "/?wait=true") == expected
+    assert discord("https://example.com/hooks/123/abc") == ()
+
+
+def test_manager_without_services_skips_apprise() -> None:
+    from config import NotificationConfig
+    from notifications import NotificationManager
+
+    cfg = Config(app_ids=["FAKE"])
+    cfg.notifications = NotificationConfig()
+    manager = NotificationManager(cfg)
+    assert manager.apprise_obj is None
+    asyncio.run(manager.send_notification("t", "m", app_id="FAKE"))
+    assert manager.last_notification == {}
+
+    # Configured but rejected by Apprise counts as no services too
+    cfg.notifications = NotificationConfig(slack_webhook_url="not-a-url")
+    manager = NotificationManager(cfg)
+    assert manager.service_count == 0 and manager.apprise_obj is None
+
+
+def test_notifications_within_window_are_combined(notifier) -> None:
+    class RecordingApprise:
+        async def async_notify(self, **kwargs):
+            sent.append((kwargs["title"], kwargs["body"]))
+            return True
+
+    sent: List[Tuple[str, str]] = []
+    notifier.apprise_obj = RecordingApprise()  # type: ignore[assignment]
+    notifier.batch_window = 0.05
+
+    async def run():
+        await asyncio.gather(
+            *(
+                notifier.send_notification(f"T{i}", f"M{i}", app_id=f"APP{i}")
+                for i in range(3)
+            )
+        )
+
+    asyncio.run(run())
+    assert sent == [("T0 (+2 more)", "T0\nM0\n\nT1\nM1\n\nT2\nM2")]
+
+
+def test_batch_survives_cancelled_leader(notifier) -> None:
+    class RecordingApprise:
+        async def async_notify(self, **kwargs):
+            sent.append(kwargs["title"])
+            return True
+
+    sent: List[str] = []
+    notifier.apprise_obj = RecordingApprise()  # type: ignore[assignment]
+    notifier.batch_window = 0.05
+
+    async def run():
+        leader = asyncio.ensure_future(notifier.send_notification("A", "a", "APPA"))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(notifier.send_notification("B", "b", "APPB"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await joiner
+
+    asyncio.run(run())
+    assert sent == ["A (+1 more)"]
+
+
+def test_pushover_url_encodes_options() -> None:
+    from notifications import _build_service_urls
+
+    def pushover(priority, sound):
+        args = [None] * 3 + [587] + [None] * 3 + ["U", "T", priority, sound]
+        return _build_service_urls(*args)
+
+    assert pushover(None, None) == (("Pushover", "pushover://U@T/"),)
+    assert pushover("1", "a&b c") == (
+        ("Pushover", "pushover://U@T/?priority=1&sound=a%26b+c"),
+    )
+
+
+def test_file_handler_counts_bytes(tmp_path, monkeypatch) -> None:
+    import io
+    import logging
+
+    from main import _log_handler_classes
+
+    # Without UTF-8 mode, FileHandler stores the "locale" placeholder
+    monkeypatch.setattr(io, "text_encoding", lambda enc, *_: enc or "locale")
+    _, file_handler_cls = _log_handler_classes()
+
+    def fail(record):
+        raise AssertionError("handleError called")
+
+    path = tmp_path / "tfm.log"
+    # Same construction as CLIApplication._install_handlers
+    handler = file_handler_cls(str(path), maxBytes=10 * 1024 * 1024, backupCount=5)
+    handler.handleError = fail  # type: ignore[method-assign]
+    for msg in ("ascii", "héllo ✓"):
+        handler.emit(logging.makeLogRecord({"msg": msg}))
+        # Every line is on disk as soon as it is emitted
+        assert handler._size == path.stat().st_size  # type: ignore[attr-defined]
+    handler.close()